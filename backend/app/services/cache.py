@@ -0,0 +1,26 @@
+"""
+Shared Redis client, so every scraper and script in the process uses one connection pool.
+Connection settings come from REDIS_HOST / REDIS_PORT / REDIS_PASSWORD (see env.example).
+"""
+import os
+from functools import lru_cache
+
+import redis
+
+REDIS_MAX_CONNECTIONS = 64
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    """
+    Return the process-wide Redis client (thread-safe), built on first use.
+    """
+    pool = redis.ConnectionPool(
+        host=os.environ.get("REDIS_HOST", "localhost"),
+        port=int(os.environ.get("REDIS_PORT", 6379)),
+        password=os.environ.get("REDIS_PASSWORD") or None,
+        db=0,
+        protocol=3,
+        max_connections=REDIS_MAX_CONNECTIONS,
+    )
+    return redis.Redis(connection_pool=pool)
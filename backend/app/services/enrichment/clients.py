@@ -0,0 +1,89 @@
+"""
+Shared, lazily created OpenAI clients and tokenizer.
+Every service in the process reuses the same instances instead of building its own.
+"""
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from functools import lru_cache
+from typing import Dict, Optional
+
+import openai
+import tiktoken
+
+from .http_client import close_async_http_client, get_async_http_client, get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Retries are left to throttle.openai_retry alone: the SDK's own retries would multiply its attempts
+# and skip the RateLimiter that LLMClient acquires before each one
+OPENAI_MAX_RETRIES = 0
+
+# AsyncOpenAI's connection pool is bound to the event loop it was first used on,
+# so async clients are shared per running loop rather than process-wide.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], openai.AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
+# The encoding is loaded (or fails to load) once; other threads wait for that result instead of downloading too
+_ENCODING_LOCK = threading.Lock()
+_NOT_LOADED = object()
+_encoding = _NOT_LOADED
+
+
+@lru_cache(maxsize=8)
+def get_openai_client(api_key: Optional[str] = None) -> openai.OpenAI:
+    """
+    Return the process-wide synchronous OpenAI client for api_key (defaults to OPENAI_API_KEY).
+    Requests reuse the shared keep-alive HTTP/2 connection pool.
+    """
+    return openai.OpenAI(
+        api_key=api_key or os.environ.get("OPENAI_API_KEY"),
+        http_client=get_http_client(),
+        max_retries=OPENAI_MAX_RETRIES,
+    )
+
+
+def get_async_openai_client(api_key: Optional[str] = None) -> openai.AsyncOpenAI:
+    """
+    Return the AsyncOpenAI client for api_key shared by all callers on the running event loop.
+    All async clients on a loop send their requests through the same HTTP/2 connection pool.
+    """
+    clients = _ASYNC_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    if api_key not in clients:
+        clients[api_key] = openai.AsyncOpenAI(
+            api_key=api_key or os.environ.get("OPENAI_API_KEY"),
+            http_client=get_async_http_client(),
+            max_retries=OPENAI_MAX_RETRIES,
+        )
+    return clients[api_key]
+
+
+async def close_async_clients() -> None:
+    """
+    Drop the running loop's AsyncOpenAI clients and close their shared connection pool.
+    asyncio.run does not close them, so call this before the loop shuts down.
+    """
+    _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    await close_async_http_client()
+
+
+def get_encoding() -> Optional[tiktoken.Encoding]:
+    """
+    Return the shared cl100k_base encoding (used by GPT-4 models), or None if it cannot be loaded.
+    """
+    global _encoding
+    if _encoding is _NOT_LOADED:
+        with _ENCODING_LOCK:
+            if _encoding is _NOT_LOADED:
+                _encoding = _load_encoding()
+    return _encoding
+
+
+def _load_encoding() -> Optional[tiktoken.Encoding]:
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Encoding files are downloaded on first use and may be unavailable (e.g. offline)
+        logger.warning(f"Could not load tiktoken encoding, falling back to estimates: {e}")
+        return None
@@ -1,59 +1,211 @@
+import asyncio
 import logging
-from typing import Dict, Any
-from .summarizer import SummarizerService
+from collections import ChainMap
+from typing import Dict, Any, List, MutableMapping, Optional
+from .summarizer import SummarizerService, AsyncSummarizerService
 from .scoring import LeadScoringEngine
 import os
 from .signal_detector import SignalDetector
+from .throttle import RateLimiter
+from .llm_cache import LLMCache
+from .llm_client import LLMClient
+from .semantic_cache import SemanticCache
+import redis
 
 """
-EnrichmentService: Enriches company data using Apollo API and generates a GPT-4 summary via SummarizerService. Adds a lead score via LeadScoringEngine.
+EnrichmentService: Enriches company data using Apollo API and generates an LLM summary via SummarizerService. Adds a lead score via LeadScoringEngine.
 """
 class EnrichmentService:
     """
-    Enriches company data using Apollo API only and generates a GPT-4 summary.
+    Enriches company data using Apollo API only and generates an LLM summary.
     Adds funding, tech stack, employee count, and more. Calculates a lead score.
     """
-    def __init__(self, apollo_enrichment_api_key: str = None, openai_api_key: str = None, scoring_config: Dict[str, Any] = None):
+    # Descriptions shorter than this, or of at most two sentences, are used as their own summary
+    SUMMARY_MIN_CHARS = 200
+    def __init__(self, apollo_enrichment_api_key: str = None, openai_api_key: str = None, scoring_config: Dict[str, Any] = None, max_concurrency: int = 8, redis_client: Optional[redis.Redis] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.apollo_enrichment_api_key = apollo_enrichment_api_key
-        self.summarizer = SummarizerService(openai_api_key=openai_api_key or os.environ.get("OPENAI_API_KEY"))
-        self.signal_detector = SignalDetector(openai_api_key=openai_api_key or os.environ.get("OPENAI_API_KEY"))
+        # One limiter for all OpenAI callers, since the RPM/TPM limits are per API key
+        self.rate_limiter = RateLimiter()
+        # Reuse the caller's Redis connection (if any) to cache LLM responses
+        self.llm_cache = LLMCache(redis_client) if redis_client is not None else None
+        self.semantic_cache = SemanticCache(redis_client, openai_api_key=openai_api_key or os.environ.get("OPENAI_API_KEY")) if redis_client is not None else None
+        # All OpenAI chat calls share one client, so retries, throttling, caching and token totals live in one place
+        self.llm = LLMClient(openai_api_key=openai_api_key or os.environ.get("OPENAI_API_KEY"), rate_limiter=self.rate_limiter, cache=self.llm_cache)
+        self.summarizer = SummarizerService(llm=self.llm, semantic_cache=self.semantic_cache)
+        self.async_summarizer = AsyncSummarizerService(llm=self.llm, semantic_cache=self.semantic_cache)
+        self.signal_detector = SignalDetector(llm=self.llm)
         self.scorer = LeadScoringEngine(config=scoring_config)
+        # Upper bound on companies enriched at once by enrich_many_async (keeps us under the OpenAI RPM limit)
+        self.max_concurrency = max_concurrency
 
     def enrich(self, company: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Enrich the company dict with additional data from Apollo API, add a GPT-4 summary, and calculate a lead score.
-        Returns a new dict with enrichment fields added.
+        Enrich the company dict with additional data from Apollo API, add an LLM summary, and calculate a lead score.
+        Returns a new dict; the input is not modified.
         """
-        enriched = company.copy()
+        return dict(self.enrich_many([company])[0])
+
+    def enrich_many(self, companies: List[Dict[str, Any]], mode: str = "sync") -> List[MutableMapping[str, Any]]:
+        """
+        Enrich several companies at once. Descriptions are summarized with a single
+        batched LLM call instead of one call per company.
+        With mode="batch" (offline backfills), summaries and signals are instead submitted to the OpenAI Batch API:
+        the returned mappings carry a summary_batch_id / signals_batch_id and get them via apply_batch_summaries.
+        Returns new mappings with enrichment fields added, in input order. They are ChainMaps layered
+        over the input dicts (see _apply_apollo); dict() them before serializing.
+        """
+        if mode not in ("sync", "batch"):
+            raise ValueError(f"Unknown enrichment mode: {mode}")
+        enriched_companies = [self._apply_apollo(company, self._enrich_with_apollo(company)) for company in companies]
+        if mode == "batch":
+            # custom_id is the company's position in the list
+            descriptions = {}
+            for i, enriched in enumerate(enriched_companies):
+                description = enriched.get("description")
+                if description and self._needs_summary(description):
+                    descriptions[str(i)] = description
+                elif description:
+                    enriched["summary"] = description
+            batch_id = self.summarizer.submit_batch(descriptions) if descriptions else None
+            if batch_id:
+                for i in descriptions:
+                    enriched_companies[int(i)]["summary_batch_id"] = batch_id
+            elif descriptions:
+                self.logger.error("Summary batch submission failed. No summaries will be added.")
+            # Signal detection is the GPT-4 call, so it goes through the Batch API as well
+            texts = {str(i): e["description"] for i, e in enumerate(enriched_companies) if e.get("description")}
+            signals_batch_id = self.signal_detector.submit_batch(texts) if texts else None
+            if signals_batch_id:
+                for i in texts:
+                    enriched_companies[int(i)]["signals_batch_id"] = signals_batch_id
+            elif texts:
+                self.logger.error("Signal batch submission failed. No signals will be added.")
+        else:
+            # Summarize all long company descriptions in batched requests (SUMMARY_BATCH_SIZE per call)
+            pending = []
+            for enriched in enriched_companies:
+                description = enriched.get("description")
+                if description and self._needs_summary(description):
+                    pending.append((enriched, description))
+                elif description:
+                    enriched["summary"] = description
+            summaries = self.summarizer.summarize_batch([description for _, description in pending])
+            for (enriched, _), summary in zip(pending, summaries):
+                self._apply_summary(enriched, summary)
+        for enriched in enriched_companies:
+            if mode == "sync":
+                # Signal detection (after summarization)
+                description = enriched.get("description")
+                signals = self.signal_detector.detect_signals(description) if description else None
+                self._apply_signals(enriched, signals)
+            # Score the lead
+            enriched["score"] = self.scorer.score(enriched)
+        return enriched_companies
+
+    def apply_batch_summaries(self, enriched_companies: List[MutableMapping[str, Any]]) -> bool:
+        """
+        Fill in summaries and signals for companies returned by enrich_many(..., mode="batch") and rescore them.
+        Pass the same list, in the same order. Returns False while any batch is still running.
+        A batch that failed, expired or was cancelled counts as done; companies it did not cover get no summary/signals.
+        """
+        complete = True
+        for field, fetch_batch, apply in (
+            ("summary_batch_id", self.summarizer.fetch_batch, self._apply_summary),
+            ("signals_batch_id", self.signal_detector.fetch_batch, self._apply_signals),
+        ):
+            batch_ids = {e[field] for e in enriched_companies if e.get(field)}
+            for batch_id in batch_ids:
+                results = fetch_batch(batch_id)
+                if results is None:
+                    complete = False
+                    continue
+                for i, enriched in enumerate(enriched_companies):
+                    if enriched.get(field) == batch_id:
+                        del enriched[field]
+                        apply(enriched, results.get(str(i)))
+                        enriched["score"] = self.scorer.score(enriched)
+        return complete
+
+    async def enrich_async(self, company: Dict[str, Any]) -> MutableMapping[str, Any]:
+        """
+        Async variant of enrich: the Apollo lookup, LLM summary and signal detection
+        run concurrently instead of one after another.
+        """
+        description = company.get("description")
+        needs_summary = bool(description) and self._needs_summary(description)
+        apollo_data, summary, signals = await asyncio.gather(
+            self._enrich_with_apollo_async(company),
+            self.async_summarizer.summarize(description) if needs_summary else _none(),
+            asyncio.to_thread(self.signal_detector.detect_signals, description) if description else _none(),
+        )
+        enriched = self._apply_apollo(company, apollo_data)
+        if needs_summary:
+            self._apply_summary(enriched, summary)
+        elif description:
+            enriched["summary"] = description
+        self._apply_signals(enriched, signals)
+        enriched["score"] = self.scorer.score(enriched)
+        return enriched
+
+    async def enrich_many_async(self, companies: List[Dict[str, Any]]) -> List[Optional[MutableMapping[str, Any]]]:
+        """
+        Enrich several companies concurrently, at most max_concurrency at a time.
+        Returns new mappings with enrichment fields added, in input order.
+        A company whose enrichment raises is logged and returned as None; the others are unaffected.
+        """
+        # Created per call: asyncio primitives are bound to the loop they are first used on
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(company: Dict[str, Any]) -> MutableMapping[str, Any]:
+            async with semaphore:
+                return await self.enrich_async(company)
+
+        results = await asyncio.gather(*(bounded(company) for company in companies), return_exceptions=True)
+        enriched_companies: List[Optional[MutableMapping[str, Any]]] = []
+        for company, result in zip(companies, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Enrichment failed for {company.get('company_name')}: {result}")
+                enriched_companies.append(None)
+            else:
+                enriched_companies.append(result)
+        return enriched_companies
+
+    def _needs_summary(self, text: str) -> bool:
+        """
+        Whether a description is long enough to be worth an LLM summary.
+        """
+        return len(text) >= self.SUMMARY_MIN_CHARS and text.count(".") + text.count("!") + text.count("?") > 2
+
+    def _apply_apollo(self, company: Dict[str, Any], apollo_data: Dict[str, Any]) -> MutableMapping[str, Any]:
+        """
+        Return the company merged with Apollo enrichment data.
+        The result is a ChainMap: new fields are written to its first map and the company dict
+        is not copied or modified. Callers that persist it convert it with dict() once.
+        """
+        enriched = ChainMap({}, company)
         self.logger.info(f"Starting enrichment for {company.get('company_name')}")
-        apollo_data = self._enrich_with_apollo(company)
         if apollo_data:
             self.logger.info("Apollo enrichment successful.")
-            enriched.update(apollo_data)
+            enriched.maps[0].update(apollo_data)
         else:
             self.logger.error("Apollo enrichment failed. Returning original data.")
-        # Summarize company description
-        description = enriched.get("description")
-        if description:
-            summary = self.summarizer.summarize(description)
-            if summary:
-                enriched["summary"] = summary
-            else:
-                self.logger.error("Summarization failed. No summary added.")
-            # Signal detection (after summarization)
-            signals = self.signal_detector.detect_signals(description)
-            if signals:
-                enriched["signals"] = signals
-                self.logger.info(f"Added {len(signals)} detected signals.")
-            else:
-                self.logger.info("No signals detected.")
+        return enriched
+
+    def _apply_summary(self, enriched: MutableMapping[str, Any], summary: Optional[str]) -> None:
+        if summary:
+            enriched["summary"] = summary
         else:
+            self.logger.error(f"Summarization failed for {enriched.get('company_name')}. No summary added.")
+
+    def _apply_signals(self, enriched: MutableMapping[str, Any], signals: Optional[List[Dict[str, str]]]) -> None:
+        if not enriched.get("description"):
             self.logger.warning("No description found to summarize or detect signals.")
-        # Score the lead
-        score = self.scorer.score(enriched)
-        enriched["score"] = score
-        return enriched
+        elif signals:
+            enriched["signals"] = signals
+            self.logger.info(f"Added {len(signals)} detected signals.")
+        else:
+            self.logger.info("No signals detected.")
 
     def _enrich_with_apollo(self, company: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -69,6 +221,16 @@ class EnrichmentService:
         # Simulate failure for other companies
         return {}
 
+    async def _enrich_with_apollo_async(self, company: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the (blocking) Apollo lookup in a worker thread so it overlaps with the OpenAI calls.
+        """
+        return await asyncio.to_thread(self._enrich_with_apollo, company)
+
+
+async def _none() -> None:
+    return None
+
 # Testability: Run independently
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -77,8 +239,7 @@ if __name__ == "__main__":
         {"company_name": "Anthropic"},
         {"company_name": "UnknownCo"}
     ]
-    for c in test_companies:
-        enriched = service.enrich(c)
+    for c, enriched in zip(test_companies, service.enrich_many(test_companies)):
         print(f"\nEnriched data for {c['company_name']}:")
         for k, v in enriched.items():
-            print(f"  {k}: {v}") 
\ No newline at end of file
+            print(f"  {k}: {v}")
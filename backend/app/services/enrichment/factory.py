@@ -0,0 +1,29 @@
+"""
+Process-wide EnrichmentService, so scrapers share one set of OpenAI clients, caches and rate limiter.
+"""
+import os
+import threading
+from typing import Optional
+
+from app.services.cache import get_redis
+
+from .enrichment import EnrichmentService
+
+_service: Optional[EnrichmentService] = None
+_service_lock = threading.Lock()
+
+
+def get_enrichment_service() -> EnrichmentService:
+    """
+    Return the shared EnrichmentService, built on first use.
+    Its LLM caches use the process-wide Redis client (get_redis), not any one scraper's client,
+    so scrapers built with different clients still share the service.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = EnrichmentService(
+                apollo_enrichment_api_key=os.environ.get("APOLLO_ENRICHMENT_API_KEY"),
+                redis_client=get_redis(),
+            )
+        return _service
@@ -0,0 +1,45 @@
+"""
+Shared HTTP/2 connection pool for outbound API calls.
+Reusing one pool (per event loop for async callers) keeps connections alive and multiplexes concurrent requests
+instead of paying a TCP/TLS handshake per call.
+"""
+import asyncio
+import weakref
+from functools import lru_cache
+
+import httpx
+
+HTTP_TIMEOUT = 30.0
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=30)
+
+# httpx.AsyncClient connections are bound to the event loop that opened them
+_ASYNC_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Return the process-wide HTTP/2 Client for synchronous callers (safe to share between threads).
+    """
+    return httpx.Client(http2=True, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Return the HTTP/2 AsyncClient shared by all callers on the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_HTTP_CLIENTS.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(http2=True, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+        _ASYNC_HTTP_CLIENTS[loop] = client
+    return client
+
+
+async def close_async_http_client() -> None:
+    """
+    Close the running loop's shared AsyncClient, if any. Call before the loop shuts down.
+    """
+    client = _ASYNC_HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,41 @@
+"""
+LLMCache: Exact-match Redis cache for LLM responses, keyed by an xxh3-128 hash of model + prompt.
+"""
+import logging
+from typing import Optional
+
+import redis
+import xxhash
+
+
+class LLMCache:
+    """
+    Stores LLM responses in Redis so an identical prompt is only sent to the API once per TTL.
+    Cache errors are logged and treated as misses; they never fail the caller.
+    """
+    def __init__(self, redis_client: redis.Redis, ttl: int = 86400):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.redis = redis_client
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        # Non-cryptographic: the hash only shortens the prompt into a key
+        digest = xxhash.xxh3_128_hexdigest(f"{model}\n{prompt}".encode())
+        return f"llm:cache:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.redis.get(key)
+        except redis.RedisError as e:
+            self.logger.warning(f"LLM cache read failed: {e}")
+            return None
+        if value is None:
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self.redis.setex(key, self.ttl, value)
+        except redis.RedisError as e:
+            self.logger.warning(f"LLM cache write failed: {e}")
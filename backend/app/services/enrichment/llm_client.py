@@ -0,0 +1,199 @@
+"""
+LLMClient: Single entry point for OpenAI chat completions.
+Applies the shared retry policy, client-side rate limiting, exact-match caching and token accounting,
+so services only build prompts and parse responses.
+"""
+import collections
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import openai
+
+from .throttle import RateLimiter, estimate_tokens, openai_retry
+from .llm_cache import LLMCache
+from .clients import get_async_openai_client, get_openai_client
+
+# Batch API states after which the batch will not produce more output
+_BATCH_ENDED = ("failed", "expired", "cancelled")
+
+
+class LLMClient:
+    """
+    Sends chat completions through one retry policy, one RateLimiter and one LLMCache.
+    Errors are logged and returned as None; callers never see OpenAI exceptions.
+    """
+    def __init__(self, openai_api_key: Optional[str] = None, rate_limiter: Optional[RateLimiter] = None, cache: Optional[LLMCache] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.cache = cache
+        # Running token totals per model, e.g. {"gpt-4": {"prompt_tokens": ..., "completion_tokens": ...}}
+        self.usage: Dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+        self._usage_lock = threading.Lock()
+
+    @property
+    def client(self) -> openai.OpenAI:
+        # Resolved on use so a missing API key surfaces as a logged call failure, not a constructor error
+        return get_openai_client(self.openai_api_key)
+
+    def chat_sync(self, messages: List[dict], *, model: str, max_tokens: int, temperature: float,
+                  cache_key: Optional[str] = None, user: Optional[str] = None) -> Optional[str]:
+        """
+        Return the stripped completion text for messages, or None if the request failed.
+        When cache_key is given, a cached response is returned without calling the API.
+        """
+        cached = self.cached(cache_key)
+        if cached:
+            return cached
+        try:
+            response = self._create(**self._request(messages, model, max_tokens, temperature, user))
+        except Exception as e:
+            self._log_error(e)
+            return None
+        return self._handle_response(response, model, cache_key)
+
+    async def chat(self, messages: List[dict], *, model: str, max_tokens: int, temperature: float,
+                   cache_key: Optional[str] = None, user: Optional[str] = None) -> Optional[str]:
+        """
+        Async variant of chat_sync built on the shared AsyncOpenAI client.
+        """
+        cached = self.cached(cache_key)
+        if cached:
+            return cached
+        try:
+            response = await self._create_async(**self._request(messages, model, max_tokens, temperature, user))
+        except Exception as e:
+            self._log_error(e)
+            return None
+        return self._handle_response(response, model, cache_key)
+
+    def submit_batch(self, requests: Dict[str, dict], name: str) -> Optional[str]:
+        """
+        Submit chat completion request bodies (keyed by custom_id) to the OpenAI Batch API.
+        Batches complete within 24h at half the token price and do not count against the real-time RPM limit.
+        Returns the batch id, or None if submission failed.
+        """
+        lines = [
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+            for custom_id, body in requests.items()
+        ]
+        try:
+            input_file = self.client.files.create(
+                file=(f"{name}.jsonl", "\n".join(lines).encode()),
+                purpose="batch",
+            )
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+        except Exception as e:
+            self._log_error(e)
+            return None
+        self.logger.info(f"Submitted {name} batch {batch.id} with {len(lines)} requests.")
+        return batch.id
+
+    def fetch_batch(self, batch_id: str) -> Optional[Dict[str, str]]:
+        """
+        Download a finished batch's completion texts as {custom_id: text}.
+        Returns None while the batch is still running (or could not be checked). A batch that failed,
+        expired or was cancelled is finished too: it returns the requests that completed, possibly none.
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in _BATCH_ENDED:
+                self.logger.error(f"Batch {batch_id} {batch.status}; using the requests that completed.")
+            elif batch.status != "completed":
+                self.logger.info(f"Batch {batch_id} is {batch.status}.")
+                return None
+            if not batch.output_file_id:
+                self.logger.error(f"Batch {batch_id} ended without output.")
+                return {}
+            output = self.client.files.content(batch.output_file_id).text
+        except Exception as e:
+            self._log_error(e)
+            return None
+        contents = {}
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            try:
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if result.get("error") or response.get("status_code") != 200:
+                    self.logger.warning(f"Batch request {result.get('custom_id')} failed: {result.get('error')}")
+                    continue
+                content = (response["body"]["choices"][0]["message"]["content"] or "").strip()
+                custom_id = result["custom_id"]
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                # One malformed result must not lose the rest of the batch
+                self.logger.warning(f"Skipping malformed line in batch {batch_id}: {e}")
+                continue
+            if content:
+                contents[custom_id] = content
+        self.logger.info(f"Fetched {len(contents)} results from batch {batch_id}.")
+        return contents
+
+    @staticmethod
+    def _request(messages: List[dict], model: str, max_tokens: int, temperature: float, user: Optional[str]) -> dict:
+        request = {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+        if user:
+            request["user"] = user
+        return request
+
+    def cached(self, cache_key: Optional[str]) -> Optional[str]:
+        """
+        Return the cached response stored under cache_key, if any.
+        """
+        if cache_key is None or self.cache is None:
+            return None
+        return self.cache.get(cache_key)
+
+    def _handle_response(self, response, model: str, cache_key: Optional[str]) -> Optional[str]:
+        self._record_usage(model, response.usage)
+        content = (response.choices[0].message.content or "").strip()
+        if not content:
+            return None
+        if cache_key is not None and self.cache is not None:
+            self.cache.set(cache_key, content)
+        return content
+
+    def _record_usage(self, model: str, usage) -> None:
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        with self._usage_lock:
+            totals = self.usage[model]
+            totals["requests"] += 1
+            totals["prompt_tokens"] += usage.prompt_tokens
+            totals["completion_tokens"] += usage.completion_tokens
+            totals["cached_tokens"] += cached_tokens
+        self.logger.info(
+            f"{model} tokens: prompt={usage.prompt_tokens} completion={usage.completion_tokens} cached={cached_tokens}"
+        )
+
+    def _log_error(self, error: Exception) -> None:
+        if isinstance(error, openai.RateLimitError):
+            self.logger.error(f"OpenAI rate limit error: {error}")
+        elif isinstance(error, openai.OpenAIError):
+            self.logger.error(f"OpenAI API error: {error}")
+        else:
+            self.logger.error(f"Unexpected error calling OpenAI: {error}")
+
+    @staticmethod
+    def _token_cost(kwargs) -> int:
+        return sum(estimate_tokens(m["content"]) for m in kwargs["messages"]) + kwargs["max_tokens"]
+
+    @openai_retry
+    def _create(self, **kwargs):
+        self.rate_limiter.acquire_sync(self._token_cost(kwargs))
+        return self.client.chat.completions.create(**kwargs)
+
+    @openai_retry
+    async def _create_async(self, **kwargs):
+        await self.rate_limiter.acquire(self._token_cost(kwargs))
+        return await get_async_openai_client(self.openai_api_key).chat.completions.create(**kwargs)
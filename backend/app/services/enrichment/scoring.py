@@ -1,5 +1,57 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+def _score_kernel_numpy(has_funding, emp_count, has_tech, has_summary, has_domain, has_ai, weights):
+    """
+    Vectorized rule-based score over parallel field arrays (same rules as LeadScoringEngine.score).
+    """
+    scores = (
+        has_funding * weights[0]
+        + (emp_count > 100) * weights[1]
+        + has_tech * weights[2]
+        + has_summary * weights[3]
+        + has_domain * weights[4]
+        + has_ai * weights[5]
+    )
+    return np.clip(scores, 0, 100).astype(np.int32)
+
+
+if _NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _score_kernel(has_funding, emp_count, has_tech, has_summary, has_domain, has_ai, weights):
+        n = has_funding.shape[0]
+        scores = np.empty(n, dtype=np.int32)
+        for i in prange(n):
+            score = 0.0
+            if has_funding[i]:
+                score += weights[0]
+            if emp_count[i] > 100:
+                score += weights[1]
+            if has_tech[i]:
+                score += weights[2]
+            if has_summary[i]:
+                score += weights[3]
+            if has_domain[i]:
+                score += weights[4]
+            if has_ai[i]:
+                score += weights[5]
+            scores[i] = int(max(0.0, min(100.0, score)))
+        return scores
+else:
+    _score_kernel = _score_kernel_numpy
+
+# Fields read by the scoring rules; a company with none of them always scores 0
+_SCORABLE_KEYS = ("funding", "employee_count", "tech_stack", "summary", "domain")
+
 
 class LeadScoringEngine:
     """
@@ -17,31 +69,71 @@ class LeadScoringEngine:
             "domain_weight": 0.1,
             "custom_rule_weight": 0.2,
         }
+        # Points awarded per rule, precomputed once instead of on every score() call
+        self._w_funding = 20 * self.config["funding_weight"]
+        self._w_employees = 20 * self.config["employee_count_weight"]
+        self._w_tech = 20 * self.config["tech_stack_weight"]
+        self._w_summary = 10 * self.config["has_summary_weight"]
+        self._w_domain = 10 * self.config["domain_weight"]
+        self._w_ai = 20 * self.config["custom_rule_weight"]
+        self._weights = np.array([
+            self._w_funding, self._w_employees, self._w_tech,
+            self._w_summary, self._w_domain, self._w_ai,
+        ], dtype=np.float64)
 
     def score(self, company: Dict[str, Any]) -> int:
         """
         Calculate a 0-100 score for the company using rule-based logic.
         """
+        # Fast path for unenriched companies (e.g. only a company_name)
+        # Membership tests, not isdisjoint: iterating a ChainMap (see EnrichmentService) merges all its keys
+        if not any(key in company for key in _SCORABLE_KEYS):
+            return 0
         score = 0
+        stack = company.get("tech_stack") or []
+        summary = company.get("summary") or ""
         # Example rules (customize as needed):
         if company.get("funding"):
-            score += 20 * self.config["funding_weight"]
+            score += self._w_funding
         if company.get("employee_count", 0) > 100:
-            score += 20 * self.config["employee_count_weight"]
-        if company.get("tech_stack"):
-            score += 20 * self.config["tech_stack_weight"]
-        if company.get("summary"):
-            score += 10 * self.config["has_summary_weight"]
+            score += self._w_employees
+        if stack:
+            score += self._w_tech
+        if summary:
+            score += self._w_summary
         if company.get("domain"):
-            score += 10 * self.config["domain_weight"]
+            score += self._w_domain
         # Custom rule: e.g., if 'AI' in summary or tech_stack
-        if (company.get("summary") and "AI" in company["summary"]) or \
-           (company.get("tech_stack") and any("AI" in t for t in company["tech_stack"])):
-            score += 20 * self.config["custom_rule_weight"]
+        if "AI" in summary or "AI" in " ".join(stack):
+            score += self._w_ai
         # Clamp score to 0-100
         score = int(max(0, min(100, score)))
         return score
 
+    def score_batch(self, companies: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Score many companies at once (e.g. when rescoring the whole DB).
+        Fields are extracted once into parallel arrays and scored by a Numba-compiled kernel
+        (or a NumPy fallback when numba is not installed). Returns an int32 array of 0-100 scores.
+        """
+        n = len(companies)
+        has_funding = np.empty(n, dtype=np.uint8)
+        emp_count = np.empty(n, dtype=np.int64)
+        has_tech = np.empty(n, dtype=np.uint8)
+        has_summary = np.empty(n, dtype=np.uint8)
+        has_domain = np.empty(n, dtype=np.uint8)
+        has_ai = np.empty(n, dtype=np.uint8)
+        for i, company in enumerate(companies):
+            summary = company.get("summary")
+            tech_stack = company.get("tech_stack")
+            has_funding[i] = bool(company.get("funding"))
+            emp_count[i] = company.get("employee_count") or 0
+            has_tech[i] = bool(tech_stack)
+            has_summary[i] = bool(summary)
+            has_domain[i] = bool(company.get("domain"))
+            has_ai[i] = bool(summary and "AI" in summary) or bool(tech_stack and "AI" in " ".join(tech_stack))
+        return _score_kernel(has_funding, emp_count, has_tech, has_summary, has_domain, has_ai, self._weights)
+
     def score_with_ml(self, company: Dict[str, Any]) -> int:
         """
         Stub for future ML/LLM-based scoring. Replace with real model.
@@ -0,0 +1,122 @@
+"""
+SemanticCache: Embedding-based cache that reuses a summary for near-duplicate company descriptions.
+"""
+import collections
+import logging
+import threading
+from typing import List, Optional
+
+import numpy as np
+import openai
+import redis
+import xxhash
+
+from .throttle import openai_retry
+from .clients import get_openai_client
+
+
+class SemanticCache:
+    """
+    Keeps (embedding, summary) pairs in memory with LRU eviction and returns the stored
+    summary when a new description's cosine similarity to a known one is >= threshold.
+    Entries are mirrored to a Redis hash so they survive restarts.
+    """
+    EMBEDDING_MODEL = "text-embedding-3-small"
+    EMBEDDING_DIM = 1536
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, threshold: float = 0.95,
+                 max_entries: int = 1000, redis_key: str = "llm:semantic:summaries", openai_api_key: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.openai_api_key = openai_api_key
+        self.redis = redis_client
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.redis_key = redis_key
+        self._entries: "collections.OrderedDict[str, tuple]" = collections.OrderedDict()
+        self._ids: List[str] = []
+        self._matrix = np.empty((0, self.EMBEDDING_DIM), dtype=np.float32)
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def client(self) -> openai.OpenAI:
+        return get_openai_client(self.openai_api_key)
+
+    def embed_many(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Embed texts with one API call. Returns L2-normalized float32 rows, or None on failure.
+        """
+        try:
+            response = self._create_embedding(model=self.EMBEDDING_MODEL, input=texts)
+            vectors = np.array([item.embedding for item in response.data], dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            return vectors
+        except Exception as e:
+            self.logger.error(f"Embedding failed, skipping semantic cache: {e}")
+            return None
+
+    def lookup(self, embedding: np.ndarray) -> Optional[str]:
+        """
+        Return the cached summary most similar to embedding, if it clears the threshold.
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+            if self._dirty:
+                self._rebuild()
+            similarities = self._matrix @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            entry_id = self._ids[best]
+            self._entries.move_to_end(entry_id)
+            self.logger.info(f"Semantic cache hit (similarity {similarities[best]:.3f}).")
+            return self._entries[entry_id][1]
+
+    def add(self, text: str, embedding: np.ndarray, summary: str) -> None:
+        entry_id = xxhash.xxh3_128_hexdigest(text.encode())
+        with self._lock:
+            self._entries[entry_id] = (embedding, summary)
+            self._entries.move_to_end(entry_id)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+            self._dirty = True
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(self.redis_key, entry_id, embedding.astype(np.float32).tobytes() + summary.encode())
+            if evicted:
+                pipe.hdel(self.redis_key, *evicted)
+            pipe.execute()
+        except redis.RedisError as e:
+            self.logger.warning(f"Semantic cache write failed: {e}")
+
+    def _rebuild(self) -> None:
+        self._ids = list(self._entries)
+        if self._ids:
+            self._matrix = np.stack([self._entries[i][0] for i in self._ids])
+        else:
+            self._matrix = np.empty((0, self.EMBEDDING_DIM), dtype=np.float32)
+        self._dirty = False
+
+    def _load(self) -> None:
+        if self.redis is None:
+            return
+        try:
+            stored = self.redis.hgetall(self.redis_key)
+        except redis.RedisError as e:
+            self.logger.warning(f"Semantic cache load failed: {e}")
+            return
+        split = self.EMBEDDING_DIM * np.dtype(np.float32).itemsize
+        for entry_id, value in list(stored.items())[-self.max_entries:]:
+            entry_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+            embedding = np.frombuffer(value[:split], dtype=np.float32)
+            self._entries[entry_id] = (embedding, value[split:].decode())
+        self._dirty = True
+
+    @openai_retry
+    def _create_embedding(self, **kwargs):
+        return self.client.embeddings.create(**kwargs)
@@ -1,60 +1,114 @@
+import json
 import logging
-import openai
-import os
 from typing import List, Dict, Optional
+from .llm_cache import LLMCache
+from .llm_client import LLMClient
+
+# raw_decode parses the first JSON value and ignores any text the model adds after it
+_decoder = json.JSONDecoder()
 
 class SignalDetector:
     """
     Uses GPT-4 to extract sales signals (funding, leadership changes, tech adoption, etc.) from unstructured text.
     Returns a list of detected signals, each with type, value, and confidence.
-    Handles API errors and logs all actions.
+    Requests go through an LLMClient, which handles retries, rate limits and caching.
     """
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(self, openai_api_key: Optional[str] = None, llm: Optional[LLMClient] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
-        openai.api_key = self.openai_api_key
+        self.llm = llm or LLMClient(openai_api_key=openai_api_key)
+
+    # Static instructions go first (as the system message) so every request shares the same
+    # prefix and OpenAI's prompt caching can reuse it; only the company text varies.
+    SYSTEM_PROMPT = (
+        "You extract critical B2B sales signals from unstructured company text.\n"
+        "Return ONLY a JSON list of objects, one per signal, with these fields:\n"
+        "- type: one of 'funding', 'leadership_change', 'tech_adoption', 'hiring', 'expansion', "
+        "'partnership', 'product_launch', 'acquisition'\n"
+        "- value: a short human-readable description of the signal "
+        "(e.g., '$50M Series B', 'New CTO: Jane Doe', 'Adopted Snowflake')\n"
+        "- confidence: 'High' if the text states the event explicitly, 'Medium' if it is strongly implied, "
+        "'Low' if it is speculative\n"
+        "Rules:\n"
+        "- Only include signals that are relevant for B2B sales intelligence.\n"
+        "- Do not invent facts that are not supported by the text.\n"
+        "- If there are no signals, return an empty list: []\n"
+        "Examples:\n"
+        "Text: Acme Corp announced a $25M Series A funding round led by Sequoia.\n"
+        'JSON: [{"type": "funding", "value": "$25M Series A led by Sequoia", "confidence": "High"}]\n'
+        "Text: Jane Doe was appointed as the new CTO. The company recently migrated to Snowflake.\n"
+        'JSON: [{"type": "leadership_change", "value": "New CTO: Jane Doe", "confidence": "High"}, '
+        '{"type": "tech_adoption", "value": "Adopted Snowflake", "confidence": "High"}]\n'
+        "Text: Globex is a software company with a strong LinkedIn presence.\n"
+        "JSON: []"
+    )
+    # Shared routing hint: requests with the same prefix land on the same cache shard
+    PROMPT_CACHE_USER = "signal-detector"
+
+    MODEL = "gpt-4"
+    MAX_TOKENS = 300
 
     def detect_signals(self, text: str) -> List[Dict[str, str]]:
-        prompt = (
-            """
-            Extract all critical sales signals from the following text. 
-            For each signal, return a JSON list of objects with these fields: 
-            - type (e.g., 'funding', 'leadership_change', 'tech_adoption')
-            - value (e.g., '$50M Series B', 'New CTO: Jane Doe', 'Adopted Snowflake')
-            - confidence (High, Medium, Low)
-            Only include signals that are relevant for B2B sales intelligence. 
-            Text:
-            """
-            f"{text}\n\nJSON:"
+        content = self.llm.chat_sync(
+            self._messages(text),
+            model=self.MODEL,
+            max_tokens=self.MAX_TOKENS,
+            temperature=0.2,
+            cache_key=LLMCache.make_key(self.MODEL, f"{self.SYSTEM_PROMPT}\n{text}"),
+            user=self.PROMPT_CACHE_USER,
+        )
+        if content is None:
+            return []
+        return self._parse_signals(content)
+
+    def submit_batch(self, texts: Dict[str, str]) -> Optional[str]:
+        """
+        Submit texts (keyed by custom_id) to the OpenAI Batch API for offline signal detection.
+        Returns the batch id, or None if submission failed.
+        """
+        return self.llm.submit_batch(
+            {
+                custom_id: {
+                    "model": self.MODEL,
+                    "messages": self._messages(text),
+                    "max_tokens": self.MAX_TOKENS,
+                    "temperature": 0.2,
+                }
+                for custom_id, text in texts.items()
+            },
+            name="signals",
         )
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
-                temperature=0.2,
-            )
-            import json
-            content = response.choices[0].message["content"].strip()
-            # Try to parse the first JSON list in the response
-            start = content.find('[')
-            end = content.rfind(']')
-            if start != -1 and end != -1:
-                signals = json.loads(content[start:end+1])
+
+    def fetch_batch(self, batch_id: str) -> Optional[Dict[str, List[Dict[str, str]]]]:
+        """
+        Download the results of a signal batch as {custom_id: signals}.
+        Returns None while the batch is still running; see LLMClient.fetch_batch for failed batches.
+        """
+        contents = self.llm.fetch_batch(batch_id)
+        if contents is None:
+            return None
+        return {custom_id: self._parse_signals(content) for custom_id, content in contents.items()}
+
+    def _messages(self, text: str) -> List[dict]:
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": f"Text: {text}\nJSON:"},
+        ]
+
+    def _parse_signals(self, content: str) -> List[Dict[str, str]]:
+        # Parse the first JSON list of signal objects in the response; other bracketed text
+        # (e.g. "see [1]") is skipped
+        start = content.find('[')
+        while start != -1:
+            try:
+                signals, _ = _decoder.raw_decode(content, start)
+            except json.JSONDecodeError:
+                signals = None
+            if isinstance(signals, list) and all(isinstance(signal, dict) for signal in signals):
                 self.logger.info(f"Extracted {len(signals)} signals.")
                 return signals
-            else:
-                self.logger.warning("No signals found in response.")
-                return []
-        except openai.RateLimitError as e:
-            self.logger.error(f"OpenAI rate limit error: {e}")
-            return []
-        except openai.OpenAIError as e:
-            self.logger.error(f"OpenAI API error: {e}")
-            return []
-        except Exception as e:
-            self.logger.error(f"Unexpected error during signal detection: {e}")
-            return []
+            start = content.find('[', start + 1)
+        self.logger.warning("No signals found in response.")
+        return []
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -1,41 +1,204 @@
 """
-SummarizerService: Uses OpenAI GPT-4 to generate concise company summaries. Handles API errors and rate limits gracefully.
+SummarizerService: Uses OpenAI gpt-4o-mini to generate concise company summaries. Handles API errors and rate limits gracefully.
 """
+import asyncio
+import json
 import logging
 import openai
-import os
-from typing import Optional
+from typing import Dict, List, Optional
+from .llm_cache import LLMCache
+from .llm_client import LLMClient
+from .semantic_cache import SemanticCache
+
+
+# Static instructions are sent first (as the system message) so requests share an identical
+# prefix that OpenAI's prompt caching can reuse; the company text always comes last.
+SUMMARY_PREFIX = "Summarize the following company description in 1-2 concise, business-focused sentences."
+BATCH_SUMMARY_PREFIX = (
+    "The input is a JSON array of company descriptions. "
+    "Summarize each description in 1-2 concise, business-focused sentences. "
+    "Return a JSON array of strings with exactly one summary per description, in input order."
+)
+# Shared routing hint: requests with the same prefix land on the same cache shard
+PROMPT_CACHE_USER = "summarizer"
+# Short summaries don't need GPT-4; signal detection stays on it
+SUMMARY_MODEL = "gpt-4o-mini"
+SUMMARY_MAX_TOKENS = 60
+# Descriptions per batched request; keeps SUMMARY_MAX_TOKENS * size well under the model's output limit
+SUMMARY_BATCH_SIZE = 20
+
+
+def _summary_messages(company_text: str) -> List[dict]:
+    return [
+        {"role": "system", "content": SUMMARY_PREFIX},
+        {"role": "user", "content": company_text},
+    ]
+
+
+def _summary_cache_key(model: str, company_text: str) -> str:
+    return LLMCache.make_key(model, f"{SUMMARY_PREFIX}\n{company_text}")
+
 
 class SummarizerService:
     """
-    Uses GPT-4 to generate a concise 1-2 line summary for a company.
-    Handles API errors and rate limits gracefully.
+    Uses gpt-4o-mini (or the given model) to generate a concise 1-2 line summary for a company.
+    Requests go through an LLMClient, which handles retries, rate limits and caching.
     """
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(self, openai_api_key: Optional[str] = None, llm: Optional[LLMClient] = None, semantic_cache: Optional[SemanticCache] = None, model: str = SUMMARY_MODEL):
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
-        openai.api_key = self.openai_api_key
+        self.llm = llm or LLMClient(openai_api_key=openai_api_key)
+        self.model = model
+        self.semantic_cache = semantic_cache
+
+    @property
+    def client(self) -> openai.OpenAI:
+        return self.llm.client
 
     def summarize(self, company_text: str) -> Optional[str]:
-        prompt = (
-            "Summarize the following company description in 1-2 concise, business-focused sentences:\n"
-            f"{company_text}"
+        return self.summarize_batch([company_text])[0]
+
+    def summarize_batch(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Summarize several company descriptions with one API call per SUMMARY_BATCH_SIZE descriptions.
+        Returns one summary per input, in input order (None where unavailable).
+        Descriptions with a cached summary are not sent to the API.
+        """
+        summaries: List[Optional[str]] = [None] * len(texts)
+        misses = []
+        for i, text in enumerate(texts):
+            cached = self.llm.cached(_summary_cache_key(self.model, text))
+            if cached:
+                summaries[i] = cached
+            else:
+                misses.append(i)
+        # Near-duplicates of already summarized descriptions reuse that summary
+        embeddings = {}
+        if misses and self.semantic_cache:
+            vectors = self.semantic_cache.embed_many([texts[i] for i in misses])
+            if vectors is not None:
+                embeddings = dict(zip(misses, vectors))
+                for i in list(misses):
+                    match = self.semantic_cache.lookup(embeddings[i])
+                    if match:
+                        summaries[i] = match
+                        misses.remove(i)
+        if not misses:
+            return summaries
+        fresh = self._request_summaries([texts[i] for i in misses])
+        for i, summary in zip(misses, fresh):
+            summaries[i] = summary
+            if summary and self.llm.cache:
+                self.llm.cache.set(_summary_cache_key(self.model, texts[i]), summary)
+            if summary and i in embeddings:
+                self.semantic_cache.add(texts[i], embeddings[i], summary)
+        return summaries
+
+    def _request_summaries(self, texts: List[str]) -> List[Optional[str]]:
+        summaries: List[Optional[str]] = []
+        for i in range(0, len(texts), SUMMARY_BATCH_SIZE):
+            summaries.extend(self._request_chunk(texts[i:i + SUMMARY_BATCH_SIZE]))
+        return summaries
+
+    def _request_chunk(self, texts: List[str]) -> List[Optional[str]]:
+        if len(texts) == 1:
+            # A single description gets the plain prompt; its reply is the summary itself, not a JSON array
+            return [self.llm.chat_sync(
+                _summary_messages(texts[0]),
+                model=self.model,
+                max_tokens=SUMMARY_MAX_TOKENS,
+                temperature=0.7,
+                user=PROMPT_CACHE_USER,
+            )]
+        # A JSON array keeps descriptions apart even when they contain newlines or numbering of their own
+        content = self.llm.chat_sync(
+            [
+                {"role": "system", "content": BATCH_SUMMARY_PREFIX},
+                {"role": "user", "content": json.dumps(texts)},
+            ],
+            model=self.model,
+            max_tokens=SUMMARY_MAX_TOKENS * len(texts),
+            temperature=0.7,
+            user=PROMPT_CACHE_USER,
         )
+        if content is None:
+            return [None] * len(texts)
+        start = content.find('[')
+        end = content.rfind(']')
+        if start == -1 or end == -1:
+            self.logger.warning("No JSON array found in batch summary response.")
+            return [None] * len(texts)
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=80,
-                temperature=0.7,
-            )
-            summary = response.choices[0].message["content"].strip()
-            return summary
-        except openai.RateLimitError as e:
-            self.logger.error(f"OpenAI rate limit error: {e}")
-            return None
-        except openai.OpenAIError as e:
-            self.logger.error(f"OpenAI API error: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"Unexpected error during summarization: {e}")
-            return None 
\ No newline at end of file
+            summaries = json.loads(content[start:end+1])
+        except ValueError as e:
+            self.logger.error(f"Could not parse batch summary response: {e}")
+            return [None] * len(texts)
+        if not isinstance(summaries, list) or len(summaries) != len(texts):
+            # Summaries can only be matched to descriptions by position, so a short or long reply
+            # would shift them onto the wrong companies (and into the caches); ask one at a time instead
+            count = len(summaries) if isinstance(summaries, list) else "no list of"
+            self.logger.warning(f"Expected {len(texts)} summaries, got {count}; summarizing individually.")
+            return [self._request_chunk([text])[0] for text in texts]
+        return [s.strip() if isinstance(s, str) and s.strip() else None for s in summaries]
+
+    def submit_batch(self, descriptions: Dict[str, str]) -> Optional[str]:
+        """
+        Submit descriptions (keyed by custom_id) to the OpenAI Batch API for offline summarization.
+        Returns the batch id, or None if submission failed.
+        """
+        return self.llm.submit_batch(
+            {
+                custom_id: {
+                    "model": self.model,
+                    "messages": _summary_messages(text),
+                    "max_tokens": SUMMARY_MAX_TOKENS,
+                    "temperature": 0.7,
+                }
+                for custom_id, text in descriptions.items()
+            },
+            name="summaries",
+        )
+
+    def fetch_batch(self, batch_id: str) -> Optional[Dict[str, str]]:
+        """
+        Download the results of a summary batch as {custom_id: summary}.
+        Returns None while the batch is still running; see LLMClient.fetch_batch for failed batches.
+        """
+        return self.llm.fetch_batch(batch_id)
+
+
+class AsyncSummarizerService:
+    """
+    Async counterpart of SummarizerService built on openai.AsyncOpenAI, so many
+    summaries can be requested concurrently from an event loop.
+    """
+    def __init__(self, openai_api_key: Optional[str] = None, llm: Optional[LLMClient] = None, semantic_cache: Optional[SemanticCache] = None, model: str = SUMMARY_MODEL):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.llm = llm or LLMClient(openai_api_key=openai_api_key)
+        self.model = model
+        self.semantic_cache = semantic_cache
+
+    async def summarize(self, company_text: str) -> Optional[str]:
+        cache_key = _summary_cache_key(self.model, company_text)
+        cached = self.llm.cached(cache_key)
+        if cached:
+            return cached
+        embedding = None
+        if self.semantic_cache:
+            # Embedding and lookup use the blocking client, so keep them off the event loop
+            vectors = await asyncio.to_thread(self.semantic_cache.embed_many, [company_text])
+            if vectors is not None:
+                embedding = vectors[0]
+                match = self.semantic_cache.lookup(embedding)
+                if match:
+                    return match
+        summary = await self.llm.chat(
+            _summary_messages(company_text),
+            model=self.model,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            temperature=0.7,
+            cache_key=cache_key,
+            user=PROMPT_CACHE_USER,
+        )
+        if summary and embedding is not None:
+            self.semantic_cache.add(company_text, embedding, summary)
+        return summary
@@ -0,0 +1,104 @@
+"""
+RateLimiter: Client-side requests-per-minute / tokens-per-minute throttle for OpenAI calls.
+Blocks before a call would exceed the limits instead of waiting for a 429 and backing off.
+"""
+import asyncio
+import collections
+import threading
+import time
+from typing import Deque, Tuple
+
+import openai
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from .clients import get_encoding
+
+# Retry policy for OpenAI calls that still hit a rate limit despite throttling, time out, lose the connection
+# or get a 5xx. The only retry layer: the shared clients are built with max_retries=0 (see clients.py).
+openai_retry = retry(
+    wait=wait_exponential(min=1, max=60),
+    stop=stop_after_attempt(3),
+    retry=retry_if_exception_type((openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)),
+    reraise=True,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of prompt tokens in text.
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        # ~4 characters per token
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+class RateLimiter:
+    """
+    Sliding one-minute windows over request timestamps and token costs.
+    Safe to share between threads and between event loops.
+    """
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, max_rpm: int = 500, max_tpm: int = 30000):
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self._requests: Deque[float] = collections.deque()
+        self._tokens: Deque[Tuple[float, int]] = collections.deque()
+        self._tokens_used = 0
+        self._lock = threading.Lock()
+
+    async def acquire(self, token_cost: int) -> None:
+        """
+        Wait (without blocking the event loop) until a request costing token_cost fits in the limits.
+        """
+        delay = self._reserve(token_cost)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._reserve(token_cost)
+
+    def acquire_sync(self, token_cost: int) -> None:
+        """
+        Blocking variant of acquire for synchronous callers.
+        """
+        delay = self._reserve(token_cost)
+        while delay > 0:
+            time.sleep(delay)
+            delay = self._reserve(token_cost)
+
+    def _reserve(self, token_cost: int) -> float:
+        """
+        Record the request and return 0 if it fits, otherwise return the seconds to wait before retrying.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            delay = 0.0
+            if len(self._requests) >= self.max_rpm:
+                delay = self._requests[0] + self.WINDOW_SECONDS - now
+            # A single request larger than the whole budget is let through once the window is empty
+            excess = self._tokens_used + token_cost - self.max_tpm
+            if excess > 0 and self._tokens:
+                freed = 0
+                for timestamp, cost in self._tokens:
+                    freed += cost
+                    if freed >= excess:
+                        delay = max(delay, timestamp + self.WINDOW_SECONDS - now)
+                        break
+                else:
+                    # Larger than the whole budget: wait until the newest entry expires and the window is empty
+                    delay = max(delay, self._tokens[-1][0] + self.WINDOW_SECONDS - now)
+            if delay > 0:
+                return delay
+            self._requests.append(now)
+            self._tokens.append((now, token_cost))
+            self._tokens_used += token_cost
+            return 0.0
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.WINDOW_SECONDS
+        while self._requests and self._requests[0] <= cutoff:
+            self._requests.popleft()
+        while self._tokens and self._tokens[0][0] <= cutoff:
+            self._tokens_used -= self._tokens.popleft()[1]
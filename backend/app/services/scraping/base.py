@@ -1,24 +1,375 @@
+import asyncio
+import atexit
+import json
 import logging
-from typing import Any, Dict, Optional
+import sys
+import threading
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Set, Tuple, Union, cast
 import redis
 from abc import ABC, abstractmethod
 
+import zstandard as zstd
+from mypy_extensions import mypyc_attr
+
+from app.services.enrichment.clients import close_async_clients
+from app.services.enrichment.enrichment import EnrichmentService
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None  # type: ignore[assignment]
+
+_dumps = getattr(orjson, "dumps", json.dumps)
+_loads = getattr(orjson, "loads", json.loads)
+
+# Frame header of zstd-compressed entries; anything else is an older uncompressed JSON entry
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# zstd (de)compressor objects must not be used from several threads at once
+_zstd = threading.local()
+
+# Cache write, stale copy and index update in one round trip; redis-py sends it with EVALSHA once loaded
+_CACHE_WRITE_SCRIPT = """
+redis.call('SETEX', KEYS[1], ARGV[1], ARGV[2])
+redis.call('SETEX', KEYS[3], ARGV[4], ARGV[2])
+redis.call('SADD', KEYS[2], ARGV[3])
+return 1
+"""
+
+
+def _encode(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize a company dict for Redis: JSON, zstd-compressed.
+    """
+    if not hasattr(_zstd, "compressor"):
+        _zstd.compressor = zstd.ZstdCompressor(level=3)
+    payload = _dumps(data)
+    return _zstd.compressor.compress(payload if isinstance(payload, bytes) else payload.encode())
+
+
+class CachedPayload(Mapping):
+    """
+    Read-only company record served from the cache. Keeps the raw JSON bytes and only parses
+    them on first access, so callers that just pass the record on (e.g. to a file) can use .raw.
+    """
+    __slots__ = ("raw", "_data")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = _loads(self.raw)
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.as_dict[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.as_dict)
+
+    def __len__(self) -> int:
+        return len(self.as_dict)
+
+    def __repr__(self) -> str:
+        return f"CachedPayload({self.as_dict!r})"
+
+
+def _decode(cached: Union[bytes, str]) -> CachedPayload:
+    """
+    Wrap a Redis cache entry written by _encode (or an uncompressed legacy entry); parsing is deferred.
+    """
+    # str only for a legacy entry read through a decode_responses=True client
+    data = cached.encode() if isinstance(cached, str) else cached
+    if data[:4] == _ZSTD_MAGIC:
+        if not hasattr(_zstd, "decompressor"):
+            _zstd.decompressor = zstd.ZstdDecompressor()
+        data = _zstd.decompressor.decompress(data)
+    return CachedPayload(data)
+
+
+# Event loop behind the sync fetch_many: one long-lived loop in a daemon thread, so the per-loop
+# HTTP/2 pool and AsyncOpenAI clients are built once instead of once per asyncio.run
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the background loop used by fetch_many, starting it on first use.
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_run_sync_loop, args=(loop,), name="scraper-sync-loop", daemon=True)
+            thread.start()
+            atexit.register(_close_sync_loop, loop, thread)
+            _sync_loop = loop
+        return _sync_loop
+
+
+def _run_sync_loop(loop: asyncio.AbstractEventLoop) -> None:
+    loop.run_forever()
+    loop.close()
+
+
+def _close_sync_loop(loop: asyncio.AbstractEventLoop, thread: threading.Thread) -> None:
+    """
+    Close the background loop's shared clients and stop it (runs at interpreter exit).
+    """
+    try:
+        asyncio.run_coroutine_threadsafe(close_async_clients(), loop).result(timeout=5)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Could not close async clients: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+@lru_cache(maxsize=4096)
+def _company_key(cache_prefix: str, company_name: str) -> str:
+    """
+    Build (and intern) the Redis key for a company; repeated lookups skip the lowercasing and formatting.
+    """
+    return sys.intern(f"{cache_prefix}:company:{company_name.lower()}")
+
+
+# Compiled by mypyc_build.py; the decorator lets interpreted sources keep subclassing it
+@mypyc_attr(allow_interpreted_subclasses=True)
 class BaseScraper(ABC):
     """
     Abstract base class for all lead scrapers.
     Enforces OOP, Redis caching, and logging patterns.
+    Subclasses set cache_prefix and an enrichment_service, and implement the scrape/parse/normalize steps.
     """
-    def __init__(self, redis_client: redis.Redis, cache_ttl: int = 3600):
+    # Redis key namespace for the source, e.g. "crunchbase". ClassVar so the compiled class reads it from
+    # the subclass; a plain attribute becomes a native slot that ignores interpreted subclasses' values.
+    cache_prefix: ClassVar[str] = ""
+    # Set by each subclass in __init__ (usually the shared get_enrichment_service instance)
+    enrichment_service: EnrichmentService
+
+    def __init__(self, redis_client: redis.Redis, cache_ttl: int = 3600, stale_ttl: int = 86400):
         self.redis = redis_client
         self.cache_ttl = cache_ttl
+        # How long an expired entry can still be served (from "<key>:stale") while it is refreshed
+        self.stale_ttl = stale_ttl
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Falls back to EVAL (and reloads the script) on NOSCRIPT
+        self._cache_write = self.redis.register_script(_CACHE_WRITE_SCRIPT)
+        # Background refreshes of stale entries (strong references so they are not garbage collected)
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        # Cache keys with a refresh in flight, so concurrent stale hits do not start another scrape
+        self._refreshing: Set[str] = set()
 
-    @abstractmethod
     def fetch_company(self, company_name: str) -> Optional[Dict[str, Any]]:
         """
         Fetch and normalize company data, using Redis cache.
+        Always returns a plain dict; the batch methods hand out CachedPayloads instead.
         """
-        pass
+        cache_key = self._cache_key(company_name)
+        try:
+            cached = self.redis.get(cache_key)
+            if cached:
+                self.logger.info(f"Cache hit for {company_name}")
+                return _decode(cached).as_dict
+            self.logger.info(f"Cache miss for {company_name}, scraping...")
+            normalized = self._build_company(company_name)
+            if normalized is None:
+                return None
+            # enrich() materializes its result as a dict, ready for caching and storage
+            enriched = self.enrichment_service.enrich(normalized)
+            self._write_cache(cache_key, company_name, _encode(enriched))
+            self._store_in_db(enriched)
+            return enriched
+        except Exception as e:
+            self.logger.error(f"Error fetching company {company_name}: {e}")
+            return None
+
+    async def fetch_company_async(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of fetch_company, so many companies and sources can be fetched concurrently.
+        An expired entry is served stale while it is refreshed in the background (see fetch_many_async).
+        """
+        try:
+            data = (await self.fetch_many_async([company_name]))[0]
+            if isinstance(data, CachedPayload):
+                return data.as_dict
+            # Fresh results are already dicts
+            return cast(Optional[Dict[str, Any]], data)
+        except Exception as e:
+            self.logger.error(f"Error fetching company {company_name}: {e}")
+            return None
+
+    def fetch_many(self, company_names: List[str]) -> List[Optional[Mapping]]:
+        """
+        Fetch several companies with one Redis MGET and one pipelined write.
+        Returns results in input order (None where no data was found).
+        Runs on a shared background event loop; inside a running loop, await fetch_many_async instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("fetch_many cannot be called from a running event loop; use await fetch_many_async()")
+        # No stale serving here: sync callers (scripts) often exit right away, which would drop the background refresh
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch_many_async(company_names, serve_stale=False), _get_sync_loop()
+        )
+        return future.result()
+
+    async def fetch_many_async(self, company_names: List[str], serve_stale: bool = True) -> List[Optional[Mapping]]:
+        """
+        Async variant of fetch_many: cache misses are scraped and enriched concurrently.
+        With serve_stale, a miss that still has a "<key>:stale" copy returns that copy at once
+        and is refreshed in a background task (await wait_for_refreshes() before the loop closes).
+        """
+        results: List[Optional[Mapping]] = [None] * len(company_names)
+        if not company_names:
+            return results
+        keys = [self._cache_key(company_name) for company_name in company_names]
+        try:
+            # redis-py calls block, so they run in worker threads like the scrapes and DB writes
+            cached_values = await asyncio.to_thread(self.redis.mget, keys)
+        except redis.RedisError as e:
+            self.logger.error(f"Cache lookup failed, scraping all companies: {e}")
+            cached_values = [None] * len(keys)
+        misses = []
+        for i, (company_name, cached) in enumerate(zip(company_names, cached_values)):
+            if cached:
+                self.logger.info(f"Cache hit for {company_name}")
+                results[i] = _decode(cached)
+            else:
+                self.logger.info(f"Cache miss for {company_name}, scraping...")
+                misses.append(i)
+        if misses and serve_stale:
+            misses = await self._serve_stale(company_names, keys, misses, results)
+        if not misses:
+            return results
+        scraped = await asyncio.gather(
+            *(asyncio.to_thread(self._build_company, company_names[i]) for i in misses),
+            return_exceptions=True,
+        )
+        found = []
+        for i, normalized in zip(misses, scraped):
+            if isinstance(normalized, BaseException):
+                self.logger.error(f"Error fetching company {company_names[i]}: {normalized}")
+            elif normalized is not None:
+                found.append((i, normalized))
+        # Enrich the normalized data (materialized once, here, for caching and storage).
+        # A company whose enrichment failed comes back as None and is neither cached nor stored.
+        enriched_companies = [
+            (i, dict(enriched))
+            for (i, _), enriched in zip(
+                found, await self.enrichment_service.enrich_many_async([normalized for _, normalized in found])
+            )
+            if enriched is not None
+        ]
+        if enriched_companies:
+            try:
+                await asyncio.to_thread(self._write_many, [
+                    (keys[i], company_names[i], _encode(enriched)) for i, enriched in enriched_companies
+                ])
+            except redis.RedisError as e:
+                self.logger.error(f"Error caching companies: {e}")
+        # DB writes are blocking, so run them in worker threads
+        stored = await asyncio.gather(
+            *(asyncio.to_thread(self._store_in_db, enriched) for _, enriched in enriched_companies),
+            return_exceptions=True,
+        )
+        for (i, enriched), error in zip(enriched_companies, stored):
+            if isinstance(error, BaseException):
+                self.logger.error(f"Error storing company {company_names[i]}: {error}")
+            results[i] = enriched
+        return results
+
+    async def wait_for_refreshes(self) -> None:
+        """
+        Wait for background refreshes scheduled by fetch_many_async to finish.
+        """
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks)
+
+    async def _serve_stale(self, company_names: List[str], keys: List[str], misses: List[int],
+                     results: List[Optional[Mapping]]) -> List[int]:
+        """
+        Fill in results for misses that still have a stale copy and schedule one background refresh for them
+        (skipping companies whose refresh is already in flight). Returns the misses that have to be scraped now.
+        """
+        try:
+            stale_values = await asyncio.to_thread(self.redis.mget, [f"{keys[i]}:stale" for i in misses])
+        except redis.RedisError as e:
+            self.logger.error(f"Stale cache lookup failed: {e}")
+            return misses
+        remaining, stale, stale_keys = [], [], []
+        for i, cached in zip(misses, stale_values):
+            if not cached:
+                remaining.append(i)
+                continue
+            results[i] = _decode(cached)
+            if keys[i] in self._refreshing:
+                self.logger.info(f"Serving stale data for {company_names[i]}, refresh already running")
+                continue
+            self.logger.info(f"Serving stale data for {company_names[i]}, refreshing in background")
+            self._refreshing.add(keys[i])
+            stale.append(company_names[i])
+            stale_keys.append(keys[i])
+        if stale:
+            task = asyncio.create_task(self._refresh(stale))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+            task.add_done_callback(lambda _: self._refreshing.difference_update(stale_keys))
+        return remaining
+
+    async def _refresh(self, company_names: List[str]) -> None:
+        """
+        Re-scrape and re-cache companies that were served stale.
+        """
+        try:
+            await self.fetch_many_async(company_names, serve_stale=False)
+        except Exception as e:
+            self.logger.error(f"Background refresh failed for {company_names}: {e}")
+
+    def _cache_key(self, company_name: str) -> str:
+        """
+        Redis key under which a company from this source is cached.
+        """
+        return _company_key(self.cache_prefix, company_name)
+
+    def _write_cache(self, cache_key: str, company_name: str, payload: bytes, client=None) -> None:
+        """
+        Cache a company payload with the scraper's TTL, keep a "<key>:stale" copy for stale_ttl,
+        and add it to the source's company index (the "<cache_prefix>:companies:index" set).
+        Pass a pipeline as client to queue the write.
+        """
+        self._cache_write(
+            keys=[cache_key, f"{self.cache_prefix}:companies:index", f"{cache_key}:stale"],
+            args=[self.cache_ttl, payload, company_name.lower(), self.stale_ttl],
+            client=client,
+        )
+
+    def _write_many(self, entries: List[Tuple[str, str, bytes]]) -> None:
+        """
+        Cache several (cache_key, company_name, payload) entries in one pipelined round trip.
+        """
+        with self.redis.pipeline(transaction=False) as pipe:
+            for cache_key, company_name, payload in entries:
+                self._write_cache(cache_key, company_name, payload, client=pipe)
+            pipe.execute()
+
+    def _build_company(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Scrape, parse and normalize a company. Returns None if the source has no data.
+        """
+        raw = self._scrape_company(company_name)
+        if not raw:
+            self.logger.warning(f"No data found for {company_name}")
+            return None
+        parsed = self.parse_company(raw)
+        return self.normalize_company(parsed)
 
     @abstractmethod
     def _scrape_company(self, company_name: str) -> Optional[Dict[str, Any]]:
@@ -46,4 +397,4 @@ class BaseScraper(ABC):
         Store the normalized company data in the database (stub).
         """
         # TODO: Implement actual DB storage
-        self.logger.info(f"Stub: storing company in DB: {company.get('company_name')}") 
\ No newline at end of file
+        self.logger.info(f"Stub: storing company in DB: {company.get('company_name')}")
@@ -1,46 +1,30 @@
-import os
 from dotenv import load_dotenv
 load_dotenv()
 from .base import BaseScraper
-import json
 from typing import Any, Dict, Optional
 import redis
 import logging
+import operator
 import requests
-from app.services.enrichment.enrichment import EnrichmentService
+from app.services.cache import get_redis
+from app.services.enrichment.factory import get_enrichment_service
+
+# Source fields and the internal schema keys they map to (same order)
+_CRUNCHBASE_FIELDS = ("name", "description", "founders", "website", "location", "founded")
+_CRUNCHBASE_KEYS = ("company_name", "description", "founders", "website", "location", "founded_year")
+_CRUNCHBASE_DEFAULTS = {**dict.fromkeys(_CRUNCHBASE_FIELDS), "description": ""}
+_getter = operator.itemgetter(*_CRUNCHBASE_FIELDS)
+_founder_name = operator.itemgetter("name")
 
 class CrunchbaseScraper(BaseScraper):
     """
     Scraper for Crunchbase company and founder data with Redis caching and enrichment.
     """
+    cache_prefix = "crunchbase"
+
     def __init__(self, redis_client: redis.Redis, cache_ttl: int = 3600):
         super().__init__(redis_client, cache_ttl)
-        self.enrichment_service = EnrichmentService(
-            apollo_enrichment_api_key=os.environ.get('APOLLO_ENRICHMENT_API_KEY')
-        )
-
-    def fetch_company(self, company_name: str) -> Optional[Dict[str, Any]]:
-        cache_key = f"crunchbase:company:{company_name.lower()}"
-        try:
-            cached = self.redis.get(cache_key)
-            if cached:
-                self.logger.info(f"Cache hit for {company_name}")
-                return json.loads(cached)
-            self.logger.info(f"Cache miss for {company_name}, scraping...")
-            raw = self._scrape_company(company_name)
-            if not raw:
-                self.logger.warning(f"No data found for {company_name}")
-                return None
-            parsed = self.parse_company(raw)
-            normalized = self.normalize_company(parsed)
-            # Enrich the normalized data
-            enriched = self.enrichment_service.enrich(normalized)
-            self.redis.setex(cache_key, self.cache_ttl, json.dumps(enriched))
-            self._store_in_db(enriched)
-            return enriched
-        except Exception as e:
-            self.logger.error(f"Error fetching company {company_name}: {e}")
-            return None
+        self.enrichment_service = get_enrichment_service()
 
     def _scrape_company(self, company_name: str) -> Optional[Dict[str, Any]]:
         try:
@@ -64,19 +48,14 @@ class CrunchbaseScraper(BaseScraper):
         return raw
 
     def normalize_company(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "company_name": parsed.get("name"),
-            "description": parsed.get("description", ""),
-            "founders": [f["name"] for f in parsed.get("founders", [])],
-            "website": parsed.get("website"),
-            "location": parsed.get("location"),
-            "founded_year": parsed.get("founded"),
-        }
+        normalized = dict(zip(_CRUNCHBASE_KEYS, _getter({**_CRUNCHBASE_DEFAULTS, **parsed})))
+        normalized["founders"] = list(map(_founder_name, normalized["founders"] or ()))
+        return normalized
 
 # Usage Example
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    r = redis.Redis(host="localhost", port=6379, db=0)
+    r = get_redis()
     scraper = CrunchbaseScraper(r)
     data = scraper.fetch_company("OpenAI")
     print(data) 
\ No newline at end of file
@@ -1,46 +1,28 @@
-import os
 from dotenv import load_dotenv
 load_dotenv()
 from .base import BaseScraper
-import json
+from .schemas import GMapsCompany
 from typing import Any, Dict, Optional
 import redis
 import logging
+import msgspec
 import requests
-from app.services.enrichment.enrichment import EnrichmentService
+from urllib.parse import urlencode
+from app.services.cache import get_redis
+from app.services.enrichment.factory import get_enrichment_service
+
+# Search URLs are this base plus an encoded ?q=<company name> query
+_GMAPS_SEARCH_URL = "https://maps.google.com/"
 
 class GoogleMapsScraper(BaseScraper):
     """
     Scraper for company location and details via Google Maps API with Redis caching and enrichment.
     """
+    cache_prefix = "googlemaps"
+
     def __init__(self, redis_client: redis.Redis, cache_ttl: int = 3600):
         super().__init__(redis_client, cache_ttl)
-        self.enrichment_service = EnrichmentService(
-            apollo_enrichment_api_key=os.environ.get('APOLLO_ENRICHMENT_API_KEY')
-        )
-
-    def fetch_company(self, company_name: str) -> Optional[Dict[str, Any]]:
-        cache_key = f"googlemaps:company:{company_name.lower()}"
-        try:
-            cached = self.redis.get(cache_key)
-            if cached:
-                self.logger.info(f"Cache hit for {company_name}")
-                return json.loads(cached)
-            self.logger.info(f"Cache miss for {company_name}, scraping...")
-            raw = self._scrape_company(company_name)
-            if not raw:
-                self.logger.warning(f"No data found for {company_name}")
-                return None
-            parsed = self.parse_company(raw)
-            normalized = self.normalize_company(parsed)
-            # Enrich the normalized data
-            enriched = self.enrichment_service.enrich(normalized)
-            self.redis.setex(cache_key, self.cache_ttl, json.dumps(enriched))
-            self._store_in_db(enriched)
-            return enriched
-        except Exception as e:
-            self.logger.error(f"Error fetching company {company_name}: {e}")
-            return None
+        self.enrichment_service = get_enrichment_service()
 
     def _scrape_company(self, company_name: str) -> Optional[Dict[str, Any]]:
         try:
@@ -50,7 +32,7 @@ class GoogleMapsScraper(BaseScraper):
                 "website": f"https://{company_name.lower()}.com",
                 "phone": "+1 650-253-0000",
                 "location": {"lat": 37.422, "lng": -122.084},
-                "googlemaps_url": f"https://maps.google.com/?q={company_name}",
+                "googlemaps_url": f"{_GMAPS_SEARCH_URL}?{urlencode({'q': company_name})}",
                 "description": f"{company_name} is located at 1600 Amphitheatre Parkway and is listed on Google Maps."
             }
         except Exception as e:
@@ -61,20 +43,13 @@ class GoogleMapsScraper(BaseScraper):
         return raw
 
     def normalize_company(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "company_name": parsed.get("name"),
-            "address": parsed.get("address"),
-            "website": parsed.get("website"),
-            "phone": parsed.get("phone"),
-            "location": parsed.get("location"),
-            "googlemaps_url": parsed.get("googlemaps_url"),
-            "description": parsed.get("description", ""),
-        }
+        # Validates types in the same pass; a malformed record raises msgspec.ValidationError
+        return msgspec.structs.asdict(msgspec.convert(parsed, GMapsCompany))
 
 # Usage Example
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    r = redis.Redis(host="localhost", port=6379, db=0)
+    r = get_redis()
     scraper = GoogleMapsScraper(r)
     data = scraper.fetch_company("Google")
     print(data) 
\ No newline at end of file
@@ -1,52 +1,36 @@
-import os
 from dotenv import load_dotenv
 load_dotenv()
 from .base import BaseScraper
-import json
+from .schemas import KasprCompany
 from typing import Any, Dict, Optional
 import redis
 import logging
+import operator
+import msgspec
 import requests
-from app.services.enrichment.enrichment import EnrichmentService
+from urllib.parse import quote
+from app.services.cache import get_redis
+from app.services.enrichment.factory import get_enrichment_service
+
+_contact_name = operator.attrgetter("name")
+# Profile URLs are this base plus the URL-quoted, lowercased company name
+_LINKEDIN_COMPANY_URL = "https://linkedin.com/company/"
 
 class KasprScraper(BaseScraper):
     """
     Scraper for LinkedIn data via Kaspr API with Redis caching and enrichment.
     """
+    cache_prefix = "kaspr"
+
     def __init__(self, redis_client: redis.Redis, cache_ttl: int = 3600):
         super().__init__(redis_client, cache_ttl)
-        self.enrichment_service = EnrichmentService(
-            apollo_enrichment_api_key=os.environ.get('APOLLO_ENRICHMENT_API_KEY')
-        )
-
-    def fetch_company(self, company_name: str) -> Optional[Dict[str, Any]]:
-        cache_key = f"kaspr:company:{company_name.lower()}"
-        try:
-            cached = self.redis.get(cache_key)
-            if cached:
-                self.logger.info(f"Cache hit for {company_name}")
-                return json.loads(cached)
-            self.logger.info(f"Cache miss for {company_name}, scraping...")
-            raw = self._scrape_company(company_name)
-            if not raw:
-                self.logger.warning(f"No data found for {company_name}")
-                return None
-            parsed = self.parse_company(raw)
-            normalized = self.normalize_company(parsed)
-            # Enrich the normalized data
-            enriched = self.enrichment_service.enrich(normalized)
-            self.redis.setex(cache_key, self.cache_ttl, json.dumps(enriched))
-            self._store_in_db(enriched)
-            return enriched
-        except Exception as e:
-            self.logger.error(f"Error fetching company {company_name}: {e}")
-            return None
+        self.enrichment_service = get_enrichment_service()
 
     def _scrape_company(self, company_name: str) -> Optional[Dict[str, Any]]:
         try:
             return {
                 "name": company_name,
-                "linkedin_url": f"https://linkedin.com/company/{company_name.lower()}",
+                "linkedin_url": _LINKEDIN_COMPANY_URL + quote(company_name.lower()),
                 "industry": "Software",
                 "employees": 120,
                 "location": "London, UK",
@@ -63,20 +47,16 @@ class KasprScraper(BaseScraper):
         return raw
 
     def normalize_company(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "company_name": parsed.get("name"),
-            "linkedin_url": parsed.get("linkedin_url"),
-            "industry": parsed.get("industry"),
-            "employees": parsed.get("employees"),
-            "location": parsed.get("location"),
-            "contacts": [c["name"] for c in parsed.get("contacts", [])],
-            "description": parsed.get("description", ""),
-        }
+        # Validates types in the same pass; a malformed record raises msgspec.ValidationError
+        company = msgspec.convert(parsed, KasprCompany)
+        normalized = msgspec.structs.asdict(company)
+        normalized["contacts"] = list(map(_contact_name, company.contacts or ()))
+        return normalized
 
 # Usage Example
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    r = redis.Redis(host="localhost", port=6379, db=0)
+    r = get_redis()
     scraper = KasprScraper(r)
     data = scraper.fetch_company("ExampleCorp")
     print(data) 
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""
+msgspec schemas that validate raw source records during normalize_company.
+Kept out of the scraper modules: mypyc (see mypyc_build.py) erases class annotations in compiled modules,
+and msgspec reads Struct fields from them.
+"""
+from typing import Dict, List, Optional
+
+import msgspec
+
+
+class GMapsCompany(msgspec.Struct, kw_only=True):
+    """
+    Validated Google Maps company record. Attribute names follow the internal schema;
+    renamed fields are read from their Google Maps source names.
+    """
+    company_name: str = msgspec.field(name="name")
+    address: Optional[str] = None
+    website: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[Dict[str, float]] = None
+    googlemaps_url: Optional[str] = None
+    description: Optional[str] = ""
+
+
+class KasprContact(msgspec.Struct, kw_only=True):
+    name: str
+    role: Optional[str] = None
+    email: Optional[str] = None
+
+
+class KasprCompany(msgspec.Struct, kw_only=True):
+    """
+    Validated Kaspr company record. Attribute names follow the internal schema;
+    renamed fields are read from their Kaspr source names.
+    """
+    company_name: str = msgspec.field(name="name")
+    linkedin_url: Optional[str] = None
+    industry: Optional[str] = None
+    employees: Optional[int] = None
+    location: Optional[str] = None
+    contacts: Optional[List[KasprContact]] = None
+    description: Optional[str] = ""
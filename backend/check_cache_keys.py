@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Check the Redis keys every scraper writes. Run from the backend directory, after mypyc_build.py:
+  python check_cache_keys.py
+Compiled attribute lookups can differ from Python's (e.g. a class-level default shadowing an
+interpreted subclass's value), so each scraper's keys are compared with the layout base.py documents,
+using the cache_prefix its .py source sets.
+Needs no Redis server: the scrapers are not connected and the cache write is only recorded.
+Exits non-zero on a mismatch.
+"""
+
+import ast
+import sys
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+
+import redis
+from redis.commands.core import Script
+
+from app.services.enrichment import factory
+from app.services.scraping import base
+from app.services.scraping.crunchbase import CrunchbaseScraper
+from app.services.scraping.angellist import AngelListScraper
+from app.services.scraping.kaspr import KasprScraper
+from app.services.scraping.googlemaps import GoogleMapsScraper
+
+_SCRAPERS = (CrunchbaseScraper, AngelListScraper, KasprScraper, GoogleMapsScraper)
+_COMPANY = "Stability AI"
+
+
+class _RecordingScript(Script):
+    """
+    Cache write script that records the keys it is called with instead of sending them to Redis.
+    """
+    def __init__(self, registered_client: redis.Redis, script: str):
+        super().__init__(registered_client, script)
+        self.keys: list = []
+
+    def __call__(self, keys=None, args=None, client=None):
+        self.keys.extend(keys or [])
+
+
+def _source_prefix(scraper_class) -> Optional[str]:
+    """
+    The cache_prefix assigned in the class body of the scraper's .py source. Read with ast, so a
+    compiled module is checked against its source rather than against itself.
+    """
+    module_file = Path(sys.modules[scraper_class.__module__].__file__)
+    source = module_file.with_name(scraper_class.__module__.rsplit(".", 1)[-1] + ".py")
+    for node in ast.walk(ast.parse(source.read_text())):
+        if not (isinstance(node, ast.ClassDef) and node.name == scraper_class.__name__):
+            continue
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                targets, value = statement.targets, statement.value
+            elif isinstance(statement, ast.AnnAssign):
+                targets, value = [statement.target], statement.value
+            else:
+                continue
+            names = [target.id for target in targets if isinstance(target, ast.Name)]
+            if "cache_prefix" in names and isinstance(value, ast.Constant):
+                return value.value
+    return None
+
+
+def _written_keys(scraper_class) -> list:
+    # The shared EnrichmentService is built without Redis, so its caches do not load from a server;
+    # the scraper's own client is never connected either
+    with mock.patch.object(factory, "get_redis", lambda: None):
+        scraper = scraper_class(redis.Redis())
+    recorder = _RecordingScript(scraper.redis, base._CACHE_WRITE_SCRIPT)
+    scraper._cache_write = recorder
+    scraper._write_cache(scraper._cache_key(_COMPANY), _COMPANY, b"{}")
+    return recorder.keys
+
+
+def main() -> int:
+    compiled = base.__file__.endswith((".so", ".pyd"))
+    print(f"BaseScraper is {'compiled' if compiled else 'pure Python'} ({base.__file__})")
+    errors = []
+    prefixes = []
+    for scraper_class in _SCRAPERS:
+        prefix = _source_prefix(scraper_class)
+        key = f"{prefix}:company:{_COMPANY.lower()}"
+        expected = [key, f"{prefix}:companies:index", f"{key}:stale"]
+        written = _written_keys(scraper_class)
+        if not prefix:
+            errors.append(f"{scraper_class.__name__} sets no cache_prefix")
+        elif written != expected:
+            errors.append(f"{scraper_class.__name__} writes {written}, expected {expected}")
+        prefixes.append(prefix)
+    if len(set(prefixes)) != len(prefixes):
+        errors.append(f"Scrapers share a cache_prefix: {prefixes}")
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        return 1
+    print(f"✅ Cache keys match the pure-Python layout for: {', '.join(prefixes)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
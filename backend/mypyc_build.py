@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Compile the scraper hot path (cache keys, Redis calls, encode/decode, normalize) to C extensions with mypyc.
+Run this from the backend directory (needs mypy and a C compiler):
+  pip install mypy
+  python mypyc_build.py build_ext --inplace
+The compiled .so files sit next to the .py sources and are imported in their place; delete them to go back
+to the pure-Python modules. Rebuild after every change to the listed modules.
+Then run check_cache_keys.py to confirm the compiled scrapers still write the same Redis keys.
+"""
+
+from setuptools import setup
+from mypyc.build import mypycify
+
+# Modules compiled ahead of time; everything else in app/ stays interpreted
+MYPYC_MODULES = [
+    "app/services/scraping/base.py",
+    "app/services/scraping/googlemaps.py",
+    "app/services/scraping/kaspr.py",
+]
+
+setup(
+    name="lead-intelligence-scrapers",
+    # Type errors are only reported for the compiled modules, not for the interpreted ones they import
+    ext_modules=mypycify(["--follow-imports=silent", *MYPYC_MODULES]),
+)
+
@@ -1,37 +1,63 @@
 #!/usr/bin/env python3
 """
 Main script to run lead intelligence scrapers.
-Run this from the backend directory: python run_scrapers.py
+Run this from the backend directory (so the app package is importable): python run_scrapers.py
+Set RUN_SMOKE_TESTS=1 to also check that a repeated fetch hits the cache.
 """
 
-import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import os
 import logging
 import redis
-from pathlib import Path
-import pprint
 import json
 
-# Add the app directory to Python path
-sys.path.insert(0, str(Path(__file__).parent / "app"))
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
 
-from services.scraping.crunchbase import CrunchbaseScraper
-from services.scraping.angellist import AngelListScraper
-from services.scraping.kaspr import KasprScraper
-from services.scraping.googlemaps import GoogleMapsScraper
+from app.services.scraping.crunchbase import CrunchbaseScraper
+from app.services.scraping.angellist import AngelListScraper
+from app.services.scraping.kaspr import KasprScraper
+from app.services.scraping.googlemaps import GoogleMapsScraper
+from app.services.scraping.base import CachedPayload
+from app.services.cache import get_redis
+from app.services.enrichment.clients import close_async_clients
 
-def main():
-    """Run all scrapers with example data."""
+# Worker threads for the blocking scrape, Apollo and DB steps of all scrapers
+MAX_WORKERS = 16
+
+def _json_default(obj):
+    """
+    Serialize cache hits: orjson embeds their raw JSON bytes as-is instead of re-encoding a parsed dict.
+    """
+    if isinstance(obj, CachedPayload):
+        if orjson is not None and hasattr(orjson, "Fragment"):
+            return orjson.Fragment(obj.raw)
+        return obj.as_dict
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_line(record) -> bytes:
+    """Serialize one output record as a newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(record, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(record, default=_json_default).encode() + b"\n"
+
+async def main():
+    """Run all scrapers with example data, fetching each scraper's companies in one batch."""
     # Setup logging
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     logger = logging.getLogger(__name__)
+    # asyncio.to_thread (used by the scrapers and enrichment) runs on the loop's default executor
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=MAX_WORKERS))
     
     try:
         # Connect to Redis
-        r = redis.Redis(host="localhost", port=6379, db=0)
+        r = get_redis()
         r.ping()  # Test connection
         logger.info("✅ Connected to Redis successfully")
     except redis.ConnectionError:
@@ -50,40 +76,55 @@ def main():
         ("Google Maps", GoogleMapsScraper(r))
     ]
     
-    # Prepare output file
-    output_path = "enriched_output.json"
-    with open(output_path, "w") as outfile:
-        all_results = {}
+    # One batched fetch per scraper (a single Redis MGET plus one pipelined write), all scrapers concurrently
+    async def fetch_all(scraper_name, scraper):
+        logger.info(f"\n🔍 Fetching {len(test_companies)} companies from {scraper_name}")
+        try:
+            return scraper_name, await scraper.fetch_many_async(test_companies)
+        except Exception as e:
+            logger.error(f"❌ Error fetching from {scraper_name}: {e}")
+            return scraper_name, [None] * len(test_companies)
+
+    # Stream one JSON line per (scraper, company) as each scraper finishes (overwrite each run)
+    output_path = "enriched_output.jsonl"
+    with open(output_path, "wb") as outfile:
+        for next_result in asyncio.as_completed([fetch_all(scraper_name, scraper) for scraper_name, scraper in scrapers]):
+            scraper_name, scraper_results = await next_result
+            for company, data in zip(test_companies, scraper_results):
+                if data is None:
+                    logger.warning(f"⚠️  {scraper_name}: no data returned for {company}")
+                    continue
+                line = _json_line({"scraper": scraper_name, "company": company, "data": data})
+                outfile.write(line)
+                if isinstance(data, CachedPayload):
+                    # Cache hit: serialized from its raw JSON; reading fields (or truth-testing it) would parse it
+                    logger.info(f"✅ {scraper_name}: {company} (cached)")
+                else:
+                    logger.info(f"✅ {scraper_name}: {data.get('company_name', company)}")
+                    logger.info(f"   Location: {data.get('location', 'N/A')}")
+                    logger.info(f"   Website: {data.get('website', 'N/A')}")
+                    if 'description' not in data or not data['description']:
+                        logger.warning(f"No description found for {data.get('company_name', company)}. Summarization will be skipped.")
+                # Full records only at DEBUG; the line is already serialized, so this costs no extra encode
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(line.decode().rstrip())
+    logger.info(f"\nFull enriched output written to {output_path}")
+
+    # Test cache hit (opt-in: it re-fetches a company on every scraper)
+    if os.environ.get("RUN_SMOKE_TESTS"):
         for scraper_name, scraper in scrapers:
-            logger.info(f"\n🔍 Testing {scraper_name} Scraper:")
-            logger.info("=" * 50)
-            all_results[scraper_name] = {}
-            for company in test_companies:
-                logger.info(f"\n📊 Fetching data for: {company}")
-                try:
-                    data = scraper.fetch_company(company)
-                    if data:
-                        logger.info(f"✅ Success: {data.get('company_name', company)}")
-                        logger.info(f"   Location: {data.get('location', 'N/A')}")
-                        logger.info(f"   Website: {data.get('website', 'N/A')}")
-                        all_results[scraper_name][company] = data
-                        if 'description' not in data or not data['description']:
-                            logger.warning(f"No description found for {data.get('company_name', company)}. Summarization will be skipped.")
-                    else:
-                        logger.warning(f"⚠️  No data returned for {company}")
-                except Exception as e:
-                    logger.error(f"❌ Error fetching {company}: {e}")
-            # Test cache hit
             logger.info(f"\n🔄 Testing cache for {scraper_name}:")
             try:
-                data = scraper.fetch_company("OpenAI")  # Should hit cache
+                data = await scraper.fetch_company_async("OpenAI")  # Should hit cache
                 if data:
                     logger.info("✅ Cache hit successful")
             except Exception as e:
                 logger.error(f"❌ Cache test failed: {e}")
-        # Write all results to file (overwrite each run)
-        json.dump(all_results, outfile, indent=2)
-    logger.info(f"\nFull enriched output written to {output_path}")
+
+    # Let background refreshes of stale entries finish before asyncio.run cancels them
+    await asyncio.gather(*(scraper.wait_for_refreshes() for _, scraper in scrapers))
+    # asyncio.run does not close this loop's shared HTTP/2 pool
+    await close_async_clients()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
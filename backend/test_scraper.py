@@ -1,79 +1,86 @@
 #!/usr/bin/env python3
 """
-Test individual scrapers.
+Test individual scrapers. Run from the backend directory (so the app package is importable).
 Usage: python test_scraper.py [scraper_name] [company_name]
+       python test_scraper.py [scraper_name] --companies FILE
 
 Examples:
   python test_scraper.py crunchbase OpenAI
   python test_scraper.py angellist Anthropic
   python test_scraper.py kaspr Stability AI
   python test_scraper.py googlemaps "Google"
+  python test_scraper.py kaspr --companies companies.txt   # one company name per line
 """
 
-import sys
+import argparse
 import logging
 import redis
-from pathlib import Path
 
-# Add the app directory to Python path
-sys.path.insert(0, str(Path(__file__).parent / "app"))
+from app.services.cache import get_redis
+from app.services.scraping.crunchbase import CrunchbaseScraper
+from app.services.scraping.angellist import AngelListScraper
+from app.services.scraping.kaspr import KasprScraper
+from app.services.scraping.googlemaps import GoogleMapsScraper
+
+# CLI name -> scraper class
+_SCRAPERS = {
+    "crunchbase": CrunchbaseScraper,
+    "angellist": AngelListScraper,
+    "kaspr": KasprScraper,
+    "googlemaps": GoogleMapsScraper,
+}
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python test_scraper.py [scraper_name] [company_name]")
-        print("Available scrapers: crunchbase, angellist, kaspr, googlemaps")
-        print("Example: python test_scraper.py crunchbase OpenAI")
-        return
-    
-    scraper_name = sys.argv[1].lower()
-    company_name = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Test individual scrapers.")
+    parser.add_argument("scraper_name", type=str.lower, help=f"one of: {', '.join(_SCRAPERS)}")
+    parser.add_argument("company_name", nargs="*", help="company to fetch, e.g. OpenAI")
+    parser.add_argument("--companies", metavar="FILE", help="fetch every company listed in FILE (one per line) in this process")
+    args = parser.parse_args()
+    if not args.company_name and not args.companies:
+        parser.error("give a company_name or --companies FILE")
     
     # Setup logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
     
+    scraper_cls = _SCRAPERS.get(args.scraper_name)
+    if scraper_cls is None:
+        logger.error(f"❌ Unknown scraper: {args.scraper_name}")
+        logger.info(f"Available scrapers: {', '.join(_SCRAPERS)}")
+        return
+    
+    if args.companies:
+        with open(args.companies, encoding="utf-8") as f:
+            company_names = [line.strip() for line in f if line.strip()]
+    else:
+        company_names = [" ".join(args.company_name)]
+    
     try:
         # Connect to Redis
-        r = redis.Redis(host="localhost", port=6379, db=0)
+        r = get_redis()
         r.ping()
         logger.info("✅ Connected to Redis")
     except redis.ConnectionError:
         logger.error("❌ Redis connection failed. Start Redis first.")
         return
     
-    # Import and test the specified scraper
-    try:
-        if scraper_name == "crunchbase":
-            from services.scraping.crunchbase import CrunchbaseScraper
-            scraper = CrunchbaseScraper(r)
-        elif scraper_name == "angellist":
-            from services.scraping.angellist import AngelListScraper
-            scraper = AngelListScraper(r)
-        elif scraper_name == "kaspr":
-            from services.scraping.kaspr import KasprScraper
-            scraper = KasprScraper(r)
-        elif scraper_name == "googlemaps":
-            from services.scraping.googlemaps import GoogleMapsScraper
-            scraper = GoogleMapsScraper(r)
-        else:
-            logger.error(f"❌ Unknown scraper: {scraper_name}")
-            return
-        
-        logger.info(f"🔍 Testing {scraper_name} scraper for: {company_name}")
-        data = scraper.fetch_company(company_name)
-        
-        if data:
-            logger.info("✅ Success!")
-            print(f"\n📊 Results for {company_name}:")
-            for key, value in data.items():
-                print(f"  {key}: {value}")
-        else:
-            logger.warning("⚠️  No data returned")
+    # One scraper (and enrichment service) for all companies
+    scraper = scraper_cls(r)
+    for company_name in company_names:
+        try:
+            logger.info(f"🔍 Testing {args.scraper_name} scraper for: {company_name}")
+            data = scraper.fetch_company(company_name)
             
-    except ImportError as e:
-        logger.error(f"❌ Import error: {e}")
-    except Exception as e:
-        logger.error(f"❌ Error: {e}")
+            if data:
+                logger.info("✅ Success!")
+                print(f"\n📊 Results for {company_name}:")
+                for key, value in data.items():
+                    print(f"  {key}: {value}")
+            else:
+                logger.warning("⚠️  No data returned")
+                
+        except Exception as e:
+            logger.error(f"❌ Error: {e}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file